@@ -1,23 +1,70 @@
 from __future__ import annotations
 
-import json
 import logging
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field, asdict
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, Union
 from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # selectolax is optional; slower parsers are used when it is missing
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - depends on installed extras
+    LexborHTMLParser = None  # type: ignore
+
+try:  # lxml is the next fastest parser when selectolax is not installed
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - depends on installed extras
+    lxml_etree = lxml_html = None  # type: ignore
+
+try:  # orjson is optional; the stdlib decoder is used when it is missing
+    import orjson as _json
+except ImportError:  # pragma: no cover - depends on installed extras
+    import json as _json  # type: ignore
+
+_loads = _json.loads
+
+_LD_JSON_XPATH = (
+    lxml_etree.XPath('//script[@type="application/ld+json"]/text()')
+    if lxml_etree is not None
+    else None
+)
+
+# Raw bytes are only passed on for UTF-8 responses (see _response_body);
+# without this, lxml decodes bytes lacking a meta charset as Latin-1.
+_LXML_PARSER = (
+    lxml_html.HTMLParser(encoding="utf-8") if lxml_html is not None else None
+)
 
 try:  # Relative import when run as package
-    from .review_parser import Review, fetch_reviews
+    from .review_parser import (
+        _DATACLASS_OPTIONS,
+        Review,
+        _response_body,
+        fetch_reviews,
+    )
 except ImportError:  # Fallback when imports are absolute
-    from review_parser import Review, fetch_reviews  # type: ignore
+    from review_parser import (  # type: ignore
+        _DATACLASS_OPTIONS,
+        Review,
+        _response_body,
+        fetch_reviews,
+    )
 
 logger = logging.getLogger("trustpilot_scraper.company")
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Company:
     ID: str
     domain: Optional[str] = None
@@ -56,9 +103,36 @@ def _create_session(config: Dict[str, Any]) -> requests.Session:
     if proxies:
         session.proxies.update(proxies)
 
+    # Size the keep-alive pool to match concurrent fetches so connections are
+    # reused instead of being re-established for every page and review fetch
+    http_config = config.get("http") or {}
+    pool_size = max(
+        int(config.get("concurrency", 8)), int(config.get("reviewConcurrency", 6))
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=int(http_config.get("retryCount", 3)),
+            backoff_factor=float(http_config.get("backoffSeconds", 0.3)),
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
     timeout = config.get("timeoutSeconds", 15)
     session.request = _wrap_request_with_timeout(session.request, timeout)  # type: ignore
 
+    # Concurrent fetches share this limiter so Trustpilot sees a steady rate
+    requests_per_second = config.get("requestsPerSecond")
+    if requests_per_second:
+        session.request = _wrap_request_with_rate_limit(  # type: ignore
+            session.request, float(requests_per_second)
+        )
+
     return session
 
 def _wrap_request_with_timeout(fn, timeout: int):
@@ -69,32 +143,92 @@ def _wrap_request_with_timeout(fn, timeout: int):
 
     return wrapped
 
+def _wrap_request_with_rate_limit(fn, requests_per_second: float):
+    interval = 1.0 / requests_per_second
+    lock = threading.Lock()
+    next_slot = [0.0]
+
+    def wrapped(method, url, **kwargs):
+        # Reserve the next free slot under the lock, then sleep outside it
+        with lock:
+            now = time.monotonic()
+            slot = max(now, next_slot[0])
+            next_slot[0] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+        return fn(method, url, **kwargs)
+
+    return wrapped
+
 def _safe_int(value: Any) -> Optional[int]:
+    # ld+json numbers are usually already ints; skip the try block for them
+    if type(value) is int:
+        return value
+    if value is None:
+        return None
     try:
-        if value is None:
-            return None
         return int(value)
     except (TypeError, ValueError):
         return None
 
 def _safe_float(value: Any) -> Optional[float]:
+    # Most values are already floats; skip the try block for them
+    if type(value) is float:
+        return value
+    if value is None:
+        return None
     try:
-        if value is None:
-            return None
         return float(value)
     except (TypeError, ValueError):
         return None
 
+@lru_cache(maxsize=1024)
+def _netloc(url: str) -> Optional[str]:
+    return urlparse(url).netloc or None
+
 def _extract_domain(url: Optional[str]) -> Optional[str]:
     if not url:
         return None
-    parsed = urlparse(url)
-    return parsed.netloc or None
+    # Many records share a host, so the parse result is cached per URL
+    return _netloc(url)
+
+@lru_cache(maxsize=16)
+def _url_origin(base_url: str) -> str:
+    parsed = urlparse(base_url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+def _absolute_url(url: str, base_url: str) -> str:
+    # Root-relative paths only need the origin prefixed; anything else
+    # (e.g. protocol-relative "//host/...") goes through urljoin.
+    if url.startswith("/") and not url.startswith("//"):
+        return _url_origin(base_url) + url
+    return urljoin(base_url, url)
+
+def _rating_label(value: Any, default: Optional[str] = None) -> Optional[str]:
+    # The "rating" block is part of the output schema and holds strings;
+    # ld+json often already provides them, so avoid re-stringifying.
+    if not value and default is not None:
+        return default
+    if value is None:
+        return None
+    if type(value) is str:
+        return value
+    return str(value)
+
+# Short values repeated across many companies (country codes, city and
+# category names) are interned so every company shares one string object.
+_INTERN_MAX_LENGTH = 32
+
+def _intern(value: Any) -> Any:
+    if type(value) is str and len(value) < _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
 
 def _company_from_ld_json(
     data: Dict[str, Any],
     base_url: str,
     categories_id_hint: Optional[str] = None,
+    updated_at: Optional[str] = None,
 ) -> Optional[Company]:
     if not isinstance(data, dict):
         return None
@@ -113,7 +247,7 @@ def _company_from_ld_json(
 
     url = data.get("url") or data.get("@id") or None
     if url and url.startswith("/"):
-        url = urljoin(base_url, url)
+        url = _absolute_url(url, base_url)
 
     agg = data.get("aggregateRating") or {}
     rating_value = _safe_float(agg.get("ratingValue"))
@@ -126,8 +260,8 @@ def _company_from_ld_json(
         address_data = {}
 
     postal = address_data.get("postalCode") or None
-    city = address_data.get("addressLocality") or None
-    country = address_data.get("addressCountry") or None
+    city = _intern(address_data.get("addressLocality") or None)
+    country = _intern(address_data.get("addressCountry") or None)
     street = address_data.get("streetAddress") or None
 
     website_url = None
@@ -159,12 +293,12 @@ def _company_from_ld_json(
         email=None,  # Trustpilot usually does not expose emails directly
         phone=data.get("telephone"),
         categories=[],
-        categoriesID=[categories_id_hint] if categories_id_hint else [],
+        categoriesID=[_intern(categories_id_hint)] if categories_id_hint else [],
         rating={
-            "bestRating": str(agg.get("bestRating") or "5"),
-            "worstRating": str(agg.get("worstRating") or "1"),
-            "ratingValue": str(rating_value) if rating_value is not None else None,
-            "reviewCount": str(review_count) if review_count is not None else None,
+            "bestRating": _rating_label(agg.get("bestRating"), "5"),
+            "worstRating": _rating_label(agg.get("worstRating"), "1"),
+            "ratingValue": _rating_label(rating_value),
+            "reviewCount": _rating_label(review_count),
         },
         data={
             # Without granular histogram we only reflect total review count
@@ -183,16 +317,21 @@ def _company_from_ld_json(
     # Derive simple category names if present
     category = data.get("category") or data.get("keywords")
     if isinstance(category, list):
-        company.categories = [str(c) for c in category]
+        company.categories = [_intern(str(c)) for c in category]
     elif isinstance(category, str):
-        company.categories = [category]
+        company.categories = [_intern(category)]
 
     # Basic AI-style text summary (no external API)
-    company.aiSummary = _build_ai_summary(company)
+    company.aiSummary = _build_ai_summary(company, updated_at=updated_at)
 
     return company
 
-def _build_ai_summary(company: Company) -> Dict[str, Any]:
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _build_ai_summary(
+    company: Company, updated_at: Optional[str] = None
+) -> Dict[str, Any]:
     # Lightweight, deterministic text summary based on available fields
     parts = []
     if company.name:
@@ -202,7 +341,8 @@ def _build_ai_summary(company: Company) -> Dict[str, Any]:
 
     if company.categories:
         parts.append(
-            f"operating in the {', '.join(sorted(set(company.categories)))} sector"
+            # dict.fromkeys dedups while keeping the ld+json category order
+            f"operating in the {', '.join(dict.fromkeys(company.categories))} sector"
         )
 
     if company.country:
@@ -227,25 +367,102 @@ def _build_ai_summary(company: Company) -> Dict[str, Any]:
         "summary": summary,
         "status": "success",
         "lang": "en",
-        "updatedAt": datetime.now(timezone.utc).isoformat(),
+        "updatedAt": updated_at or _utc_now_iso(),
     }
 
+class _LdJsonScriptCollector(HTMLParser):
+    """
+    Event-driven fallback that only buffers the text of ld+json scripts and
+    never builds a tree for the rest of the page.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.blocks: List[str] = []
+        self._buffer: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script" and ("type", "application/ld+json") in attrs:
+            self._buffer = []
+
+    def handle_data(self, data):
+        if self._buffer is not None:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._buffer is not None:
+            self.blocks.append("".join(self._buffer))
+            self._buffer = None
+
+def _iter_ld_json_scripts(html: Union[str, bytes]) -> Iterable[str]:
+    """
+    Yield the raw text of every <script type="application/ld+json"> block.
+
+    selectolax (lexbor) is preferred, then lxml; both are C-backed. Without
+    either, a streaming stdlib HTMLParser collects the blocks.
+
+    UTF-8 pages arrive as raw bytes, which lexbor and lxml decode
+    themselves (lexbor always as UTF-8); pages in other charsets arrive
+    already decoded. The stdlib fallback decodes bytes as UTF-8.
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        for script in tree.css('script[type="application/ld+json"]'):
+            yield script.text()
+        return
+
+    if _LD_JSON_XPATH is not None:
+        try:
+            tree = lxml_html.fromstring(
+                html, parser=_LXML_PARSER if isinstance(html, bytes) else None
+            )
+        except (lxml_etree.ParserError, ValueError):
+            return
+        # XPath text results are str subclasses, which orjson rejects
+        for text in _LD_JSON_XPATH(tree):
+            yield str(text)
+        return
+
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    collector = _LdJsonScriptCollector()
+    collector.feed(html)
+    collector.close()
+    yield from collector.blocks
+
+def _company_key(company: Company) -> str:
+    # Fall back to domain if ID is missing
+    return company.ID or company.domain or company.sourceUrl or ""
+
+# Matches the @type values _company_from_ld_json accepts, in any letter case
+# (it lowercases @type before checking)
+_has_business_type = re.compile(r"organization|localbusiness", re.I).search
+
 def _parse_ld_json_blocks(
-    html: str,
+    html: Union[str, bytes],
     base_url: str,
     categories_id_hint: Optional[str] = None,
-) -> List[Company]:
-    soup = BeautifulSoup(html, "html.parser")
-    companies: List[Company] = []
-    seen_ids: set[str] = set()
+    updated_at: Optional[str] = None,
+) -> Dict[str, Company]:
+    """
+    Parse every ld+json business block on a page, keyed by `_company_key`
+    so that callers can merge pages without a separate dedup pass.
 
-    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
-        raw = script.string or script.text
+    `updated_at` is shared by every summary on the page (and, from
+    search_companies, by the whole batch); it defaults to the current time.
+    """
+    updated_at = updated_at or _utc_now_iso()
+    companies: Dict[str, Company] = {}
+
+    for raw in _iter_ld_json_scripts(html):
         if not raw:
             continue
+        # Skip WebSite/BreadcrumbList/... blocks without decoding them
+        if not _has_business_type(raw):
+            continue
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+            data = _loads(raw)
+        except ValueError:  # json and orjson decode errors both subclass it
             continue
 
         items: Iterable[Any]
@@ -258,31 +475,54 @@ def _parse_ld_json_blocks(
             if not isinstance(item, dict):
                 continue
             company = _company_from_ld_json(
-                item, base_url=base_url, categories_id_hint=categories_id_hint
+                item,
+                base_url=base_url,
+                categories_id_hint=categories_id_hint,
+                updated_at=updated_at,
             )
-            if company and company.ID not in seen_ids:
-                seen_ids.add(company.ID)
-                companies.append(company)
+            if not company:
+                continue
+            key = _company_key(company)
+            if key and key not in companies:
+                companies[key] = company
 
     return companies
 
 def _fetch_page(
     session: requests.Session, url: str
-) -> Optional[str]:
+) -> Optional[Union[str, bytes]]:
     try:
         logger.debug("Fetching URL: %s", url)
         resp = session.get(url)
         if not resp.ok:
             logger.warning("Non-200 response from %s: %s", url, resp.status_code)
             return None
-        return resp.text
+        return _response_body(resp)
     except requests.RequestException as exc:
         logger.error("Request error for %s: %s", url, exc)
         return None
 
+def _fetch_pages(
+    session: requests.Session,
+    urls: List[str],
+    config: Dict[str, Any],
+) -> Iterable[Optional[Union[str, bytes]]]:
+    """
+    Fetch several pages concurrently, yielding their bodies in the order of
+    `urls`. The pool size is bounded by config["concurrency"].
+    """
+    workers = max(1, min(int(config.get("concurrency", 8)), len(urls)))
+    if workers == 1:
+        for url in urls:
+            yield _fetch_page(session, url)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(lambda url: _fetch_page(session, url), urls)
+
 def _attach_reviews_to_companies(
     session: requests.Session,
-    companies: List[Company],
+    companies: Iterable[Company],
     config: Dict[str, Any],
     params: Dict[str, Any],
 ) -> None:
@@ -293,26 +533,36 @@ def _attach_reviews_to_companies(
     max_reviews = params.get("maxReviewsPerCompany")
     language = params.get("language") or config.get("defaultLanguage", "en")
 
-    for company in companies:
-        if not company.sourceUrl:
-            continue
-        try:
-            reviews = fetch_reviews(
+    targets = [company for company in companies if company.sourceUrl]
+    if not targets:
+        return
+
+    workers = max(1, min(int(config.get("reviewConcurrency", 6)), len(targets)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                fetch_reviews,
                 session=session,
                 company_url=company.sourceUrl,
                 language=language,
                 max_reviews=max_reviews,
                 config=config,
-            )
-        except Exception as exc:
-            logger.error(
-                "Failed fetching reviews for %s: %s", company.sourceUrl, exc
-            )
-            continue
+            ): company
+            for company in targets
+        }
+        for future in as_completed(futures):
+            company = futures[future]
+            try:
+                reviews = future.result()
+            except Exception as exc:
+                logger.error(
+                    "Failed fetching reviews for %s: %s", company.sourceUrl, exc
+                )
+                continue
 
-        company.reviews = reviews
-        # lastReviews is the most recent subset
-        company.lastReviews = reviews[:3] if reviews else []
+            company.reviews = reviews
+            # lastReviews is the most recent subset
+            company.lastReviews = reviews[:3] if reviews else []
 
 def _limit_pages(params: Dict[str, Any], config: Dict[str, Any]) -> int:
     if params.get("allPages"):
@@ -325,26 +575,34 @@ def _search_by_category(
     base_url: str,
     params: Dict[str, Any],
     config: Dict[str, Any],
-) -> List[Company]:
+    updated_at: Optional[str] = None,
+) -> Dict[str, Company]:
     category_id = params.get("categoryId")
     if not category_id:
         raise ValueError('For searchType="category" you must provide "categoryId".')
 
     pages_to_fetch = _limit_pages(params, config)
-    companies: List[Company] = []
+    companies: Dict[str, Company] = {}
 
-    for page in range(1, pages_to_fetch + 1):
-        url = f"{base_url}/categories/{category_id}?page={page}"
-        html = _fetch_page(session, url)
+    urls = [
+        f"{base_url}/categories/{category_id}?page={page}"
+        for page in range(1, pages_to_fetch + 1)
+    ]
+    for page, html in enumerate(_fetch_pages(session, urls, config), start=1):
         if not html:
             continue
         batch = _parse_ld_json_blocks(
-            html, base_url=base_url, categories_id_hint=str(category_id)
+            html,
+            base_url=base_url,
+            categories_id_hint=str(category_id),
+            updated_at=updated_at,
         )
         logger.info("Category page %d yielded %d companies.", page, len(batch))
-        companies.extend(batch)
+        # Keep the first occurrence of companies repeated across pages
+        for key, company in batch.items():
+            companies.setdefault(key, company)
 
-    _attach_reviews_to_companies(session, companies, config, params)
+    _attach_reviews_to_companies(session, companies.values(), config, params)
     return companies
 
 def _search_by_keyword(
@@ -352,24 +610,31 @@ def _search_by_keyword(
     base_url: str,
     params: Dict[str, Any],
     config: Dict[str, Any],
-) -> List[Company]:
+    updated_at: Optional[str] = None,
+) -> Dict[str, Company]:
     keyword = params.get("keyword")
     if not keyword:
         raise ValueError('For searchType="keyword" you must provide "keyword".')
 
     pages_to_fetch = _limit_pages(params, config)
-    companies: List[Company] = []
+    companies: Dict[str, Company] = {}
 
-    for page in range(1, pages_to_fetch + 1):
-        url = f"{base_url}/search?query={keyword}&page={page}"
-        html = _fetch_page(session, url)
+    urls = [
+        f"{base_url}/search?query={keyword}&page={page}"
+        for page in range(1, pages_to_fetch + 1)
+    ]
+    for page, html in enumerate(_fetch_pages(session, urls, config), start=1):
         if not html:
             continue
-        batch = _parse_ld_json_blocks(html, base_url=base_url)
+        batch = _parse_ld_json_blocks(
+            html, base_url=base_url, updated_at=updated_at
+        )
         logger.info("Search page %d yielded %d companies.", page, len(batch))
-        companies.extend(batch)
+        # Keep the first occurrence of companies repeated across pages
+        for key, company in batch.items():
+            companies.setdefault(key, company)
 
-    _attach_reviews_to_companies(session, companies, config, params)
+    _attach_reviews_to_companies(session, companies.values(), config, params)
     return companies
 
 def _search_detail(
@@ -377,7 +642,8 @@ def _search_detail(
     base_url: str,
     params: Dict[str, Any],
     config: Dict[str, Any],
-) -> List[Company]:
+    updated_at: Optional[str] = None,
+) -> Dict[str, Company]:
     domain = params.get("domain")
     if not domain:
         raise ValueError('For searchType="detail" you must provide "domain".')
@@ -386,14 +652,16 @@ def _search_detail(
     url = f"{base_url}/review/{domain}"
     html = _fetch_page(session, url)
     if not html:
-        return []
+        return {}
 
-    companies = _parse_ld_json_blocks(html, base_url=base_url)
+    companies = _parse_ld_json_blocks(
+        html, base_url=base_url, updated_at=updated_at
+    )
     if not companies:
         logger.warning("No company metadata found for domain %s", domain)
-        return []
+        return {}
 
-    _attach_reviews_to_companies(session, companies, config, params)
+    _attach_reviews_to_companies(session, companies.values(), config, params)
     return companies
 
 def search_companies(
@@ -414,29 +682,27 @@ def search_companies(
     """
     base_url = config.get("baseUrl", "https://www.trustpilot.com").rstrip("/")
     session = _create_session(config)
+    # Every summary in one scrape shares the batch timestamp
+    updated_at = _utc_now_iso()
 
     search_type = (params.get("searchType") or "category").lower()
     logger.info("Starting search with type '%s'.", search_type)
 
     if search_type == "category":
-        companies = _search_by_category(session, base_url, params, config)
+        companies = _search_by_category(
+            session, base_url, params, config, updated_at=updated_at
+        )
     elif search_type == "keyword":
-        companies = _search_by_keyword(session, base_url, params, config)
+        companies = _search_by_keyword(
+            session, base_url, params, config, updated_at=updated_at
+        )
     elif search_type == "detail":
-        companies = _search_detail(session, base_url, params, config)
+        companies = _search_detail(
+            session, base_url, params, config, updated_at=updated_at
+        )
     else:
         raise ValueError(f"Unsupported searchType: {search_type}")
 
-    # Remove duplicates by ID while keeping first occurrence
-    unique: Dict[str, Company] = {}
-    for company in companies:
-        if not company.ID:
-            # Fall back to domain if ID is missing
-            key = company.domain or company.sourceUrl or ""
-        else:
-            key = company.ID
-        if key and key not in unique:
-            unique[key] = company
-
-    logger.info("Search completed, %d unique companies collected.", len(unique))
-    return list(unique.values())
\ No newline at end of file
+    # Companies are already keyed (and deduplicated) by _company_key
+    logger.info("Search completed, %d unique companies collected.", len(companies))
+    return list(companies.values())
\ No newline at end of file
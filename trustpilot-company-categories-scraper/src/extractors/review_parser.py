@@ -2,17 +2,154 @@ from __future__ import annotations
 
 import json
 import logging
+import re
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+
+try:  # selectolax is optional; lxml, then BeautifulSoup, is used without it
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - depends on installed extras
+    LexborHTMLParser = None  # type: ignore
+
+try:  # lxml (with cssselect) is the next fastest option
+    from cssselect import HTMLTranslator
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - depends on installed extras
+    HTMLTranslator = lxml_etree = lxml_html = None  # type: ignore
+
+try:  # BeautifulSoup is the pure-Python last resort
+    from bs4 import BeautifulSoup
+except ImportError:  # pragma: no cover - depends on installed extras
+    BeautifulSoup = None  # type: ignore
 
 logger = logging.getLogger("trustpilot_scraper.reviews")
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+ only)
+_DATACLASS_OPTIONS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+# Selectors are tried in order and the first one that matches wins, so the
+# data-* attributes take precedence over the older class-based markup.
+_SEL_CARDS = ("[data-service-review-id]", ".review-card")
+_SEL_TITLE = ("h2", ".review-title")
+_SEL_TEXT = ("[data-review-text-typography]", ".review-content__text")
+_SEL_DATE = ("time",)
+_SEL_RATING = ("[data-rating]", "[data-service-review-rating]")
+_SEL_RATING_LABEL = ("[aria-label*='Rated']",)
+_SEL_REVIEW_LINK = ("a[href]",)
+_SEL_NAME = ("[data-consumer-name]", ".consumer-information__name")
+_SEL_IMAGE = ("img",)
+_SEL_COUNTRY = ("[data-consumer-country]", ".consumer-information__details")
+_SEL_REVIEWS_COUNT = ("[data-consumer-reviews-count]",)
+_SEL_VERIFIED = (".badge--verified", "[data-review-verified='true']")
+
+_ALL_SELECTORS = (
+    _SEL_CARDS
+    + _SEL_TITLE
+    + _SEL_TEXT
+    + _SEL_DATE
+    + _SEL_RATING
+    + _SEL_RATING_LABEL
+    + _SEL_REVIEW_LINK
+    + _SEL_NAME
+    + _SEL_IMAGE
+    + _SEL_COUNTRY
+    + _SEL_REVIEWS_COUNT
+    + _SEL_VERIFIED
+)
+
+# Thin accessors over the parser backend so the extraction code below does not
+# depend on whether lexbor, lxml or BeautifulSoup built the tree.
+if LexborHTMLParser is not None:
+
+    def _parse_tree(html: Union[str, bytes]):
+        return LexborHTMLParser(html)
+
+    def _css(node, selector: str) -> list:
+        return node.css(selector)
+
+    def _css_first(node, selector: str):
+        return node.css_first(selector)
+
+    def _text(node) -> str:
+        return node.text(strip=True)
+
+    def _attr(node, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+elif lxml_html is not None:
+    # Selectors are translated to XPath and compiled once at import time
+    _XPATHS = {
+        selector: lxml_etree.XPath(
+            HTMLTranslator().css_to_xpath(selector, prefix="descendant::")
+        )
+        for selector in _ALL_SELECTORS
+    }
+    _TEXT_NODES = lxml_etree.XPath(".//text()")
+    # Bytes are only passed on for UTF-8 responses (see _response_body);
+    # without this, lxml decodes bytes lacking a meta charset as Latin-1.
+    _LXML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+    def _parse_tree(html: Union[str, bytes]):
+        # document_fromstring always wraps the input in <html>, so a card
+        # that is the fragment's root is still found by "descendant::"
+        try:
+            return lxml_html.document_fromstring(
+                html, parser=_LXML_PARSER if isinstance(html, bytes) else None
+            )
+        except (lxml_etree.ParserError, ValueError):
+            return lxml_html.Element("html")
+
+    def _css(node, selector: str) -> list:
+        return _XPATHS[selector](node)
+
+    def _css_first(node, selector: str):
+        found = _XPATHS[selector](node)
+        return found[0] if found else None
+
+    def _text(node) -> str:
+        return "".join(t.strip() for t in _TEXT_NODES(node))
+
+    def _attr(node, name: str) -> Optional[str]:
+        return node.get(name)
+
+else:  # pragma: no cover - exercised only without selectolax or lxml
+
+    def _parse_tree(html: Union[str, bytes]):
+        if BeautifulSoup is None:
+            raise ImportError(
+                "Parsing reviews requires selectolax, lxml (with cssselect) "
+                "or beautifulsoup4."
+            )
+        return BeautifulSoup(html, "html.parser")
+
+    def _css(node, selector: str) -> list:
+        return node.select(selector)
+
+    def _css_first(node, selector: str):
+        return node.select_one(selector)
+
+    def _text(node) -> str:
+        return node.get_text(strip=True)
+
+    def _attr(node, name: str) -> Optional[str]:
+        return node.get(name)
+
+def _first(node, selectors: Sequence[str]):
+    for selector in selectors:
+        found = _css_first(node, selector)
+        if found is not None:
+            return found
+    return None
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Consumer:
     id: Optional[str]
     displayName: Optional[str]
@@ -21,7 +158,7 @@ class Consumer:
     numberOfReviews: Optional[int]
     countryCode: Optional[str]
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Review:
     id: Optional[str]
     text: Optional[str]
@@ -31,17 +168,39 @@ class Review:
     consumer: Consumer
 
 def _safe_int(value: Any) -> Optional[int]:
+    # ld+json numbers are usually already ints; skip the try block for them
+    if type(value) is int:
+        return value
+    if value is None:
+        return None
     try:
-        if value is None:
-            return None
         return int(value)
     except (TypeError, ValueError):
         return None
 
+# UTC timestamps as emitted by Trustpilot (e.g. 2024-01-15T10:30:00.000Z)
+# that are valid dates by construction: only ASCII digits, range-checked
+# fields, and days 29-31 (which depend on the month) and year 0000 are left
+# to datetime.fromisoformat, so invalid dates still come back unchanged.
+_ISO_UTC_RE = re.compile(
+    r"((?!0000)[0-9]{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|1[0-9]|2[0-8])"
+    r"T(?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9])(?:\.([0-9]{1,6}))?Z",
+    re.ASCII,
+)
+
 def _parse_date_iso(raw: str) -> Dict[str, Any]:
     """
     Normalize any parseable date string into the JSON structure used in the README.
     """
+    match = _ISO_UTC_RE.fullmatch(raw)
+    if match:
+        # Fast path: rebuild what datetime.isoformat() would return without
+        # parsing (fraction padded to microseconds, dropped when zero).
+        base, fraction = match.groups()
+        if fraction and fraction.strip("0"):
+            base += "." + fraction.ljust(6, "0")
+        return {"createdAt": base + "+00:00"}
+
     created_at: Optional[str] = None
     try:
         # Trustpilot typically uses ISO timestamps already
@@ -53,33 +212,27 @@ def _parse_date_iso(raw: str) -> Dict[str, Any]:
 
 def _extract_consumer_from_card(card) -> Consumer:
     # HTML is likely to change over time; we defensively look for common patterns.
-    name_el = card.select_one("[data-consumer-name]") or card.select_one(
-        ".consumer-information__name"
-    )
-    name = name_el.get_text(strip=True) if name_el else None
+    name_el = _first(card, _SEL_NAME)
+    name = _text(name_el) if name_el is not None else None
 
-    img_el = card.select_one("img")
-    image_url = img_el["src"] if img_el and img_el.has_attr("src") else None
+    img_el = _first(card, _SEL_IMAGE)
+    image_url = _attr(img_el, "src") if img_el is not None else None
 
-    country_el = card.select_one("[data-consumer-country]") or card.select_one(
-        ".consumer-information__details"
-    )
+    country_el = _first(card, _SEL_COUNTRY)
     country_code = None
-    if country_el:
-        country_text = country_el.get_text(strip=True)
+    if country_el is not None:
+        country_text = _text(country_el)
         if country_text and len(country_text) <= 3:
             country_code = country_text.upper()
 
-    reviews_count_el = card.select_one("[data-consumer-reviews-count]")
+    reviews_count_el = _first(card, _SEL_REVIEWS_COUNT)
     number_of_reviews = _safe_int(
-        reviews_count_el.get("data-consumer-reviews-count")
-        if reviews_count_el
+        _attr(reviews_count_el, "data-consumer-reviews-count")
+        if reviews_count_el is not None
         else None
     )
 
-    is_verified = bool(card.select_one(".badge--verified") or card.select_one(
-        "[data-review-verified='true']"
-    ))
+    is_verified = _first(card, _SEL_VERIFIED) is not None
 
     return Consumer(
         id=None,
@@ -91,18 +244,17 @@ def _extract_consumer_from_card(card) -> Consumer:
     )
 
 def _extract_rating_from_card(card) -> Optional[int]:
-    rating_el = card.select_one("[data-rating]") or card.select_one(
-        "[data-service-review-rating]"
-    )
-    if rating_el and rating_el.has_attr("data-rating"):
-        return _safe_int(rating_el["data-rating"])
-    if rating_el and rating_el.has_attr("data-service-review-rating"):
-        return _safe_int(rating_el["data-service-review-rating"])
+    rating_el = _first(card, _SEL_RATING)
+    if rating_el is not None:
+        for name in ("data-rating", "data-service-review-rating"):
+            value = _attr(rating_el, name)
+            if value is not None:
+                return _safe_int(value)
 
     # Fallback: look for star icons with an aria-label like "Rated 5 out of 5 stars"
-    aria_el = card.select_one("[aria-label*='Rated']")
-    if aria_el and aria_el.has_attr("aria-label"):
-        text = aria_el["aria-label"]
+    aria_el = _first(card, _SEL_RATING_LABEL)
+    text = _attr(aria_el, "aria-label") if aria_el is not None else None
+    if text:
         for token in text.split():
             maybe = _safe_int(token)
             if maybe is not None:
@@ -111,45 +263,47 @@ def _extract_rating_from_card(card) -> Optional[int]:
 
 def _extract_review_id(card) -> Optional[str]:
     # Many review cards use an anchor with href containing the review ID.
-    link = card.find("a", href=True)
-    if not link:
+    link = _first(card, _SEL_REVIEW_LINK)
+    if link is None:
         return None
 
-    href = link["href"]
+    href = _attr(link, "href")
+    if not href:
+        return None
     parsed = urlparse(href)
     parts = [p for p in parsed.path.split("/") if p]
     if parts:
         return parts[-1]
     return href
 
-def _parse_reviews_from_html(html: str) -> List[Review]:
-    soup = BeautifulSoup(html, "html.parser")
+def _parse_reviews_from_html(html: Union[str, bytes]) -> List[Review]:
+    tree = _parse_tree(html)
 
     # Trustpilot typically wraps reviews in elements with data-service-review-id
-    review_cards = soup.select("[data-service-review-id]") or soup.select(
-        ".review-card"
-    )
+    review_cards: list = []
+    for selector in _SEL_CARDS:
+        review_cards = _css(tree, selector)
+        if review_cards:
+            break
 
     reviews: List[Review] = []
     for card in review_cards:
-        title_el = card.select_one("h2") or card.select_one(".review-title")
-        title = title_el.get_text(strip=True) if title_el else None
+        title_el = _first(card, _SEL_TITLE)
+        title = _text(title_el) if title_el is not None else None
 
-        text_el = card.select_one("[data-review-text-typography]") or card.select_one(
-            ".review-content__text"
-        )
-        text = text_el.get_text(strip=True) if text_el else None
+        text_el = _first(card, _SEL_TEXT)
+        text = _text(text_el) if text_el is not None else None
 
         rating = _extract_rating_from_card(card)
 
-        date_el = card.select_one("time")
-        date_raw = date_el["datetime"] if date_el and date_el.has_attr("datetime") else (
-            date_el.get_text(strip=True) if date_el else ""
-        )
+        date_el = _first(card, _SEL_DATE)
+        date_raw = ""
+        if date_el is not None:
+            date_raw = _attr(date_el, "datetime") or _text(date_el)
         date_obj = _parse_date_iso(date_raw) if date_raw else {"createdAt": None}
 
         consumer = _extract_consumer_from_card(card)
-        review_id = card.get("data-service-review-id") or _extract_review_id(card)
+        review_id = _attr(card, "data-service-review-id") or _extract_review_id(card)
 
         reviews.append(
             Review(
@@ -164,6 +318,20 @@ def _parse_reviews_from_html(html: str) -> List[Review]:
 
     return reviews
 
+_UTF8_LABELS = frozenset({"utf-8", "utf8", "utf_8"})
+
+def _response_body(resp: requests.Response) -> Union[str, bytes]:
+    """
+    Return the body in the form the parsers should get. UTF-8 (or
+    unlabelled) responses are passed as raw bytes, which the parsers decode
+    themselves. Any other HTTP charset is applied by requests, because
+    lexbor always assumes UTF-8 for bytes.
+    """
+    encoding = resp.encoding
+    if encoding is None or encoding.lower() in _UTF8_LABELS:
+        return resp.content
+    return resp.text
+
 def fetch_reviews(
     session: requests.Session,
     company_url: str,
@@ -194,7 +362,7 @@ def fetch_reviews(
         )
         return []
 
-    reviews = _parse_reviews_from_html(resp.text)
+    reviews = _parse_reviews_from_html(_response_body(resp))
     logger.info("Parsed %d reviews for %s", len(reviews), company_url)
 
     if max_reviews is not None and max_reviews >= 0:
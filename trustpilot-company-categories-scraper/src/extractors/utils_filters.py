@@ -8,12 +8,23 @@ try:
 except ImportError:
     from company_parser import Company  # type: ignore
 
+try:  # numpy is optional; it only speeds up filtering of large result sets
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on installed extras
+    np = None  # type: ignore
+
 logger = logging.getLogger("trustpilot_scraper.filters")
 
+# Below this size the per-company loop is cheaper than building arrays
+_VECTORIZE_THRESHOLD = 256
+
 def _safe_float(value: Any) -> Optional[float]:
+    # Most values are already floats; skip the try block for them
+    if type(value) is float:
+        return value
+    if value is None:
+        return None
     try:
-        if value is None:
-            return None
         return float(value)
     except (TypeError, ValueError):
         return None
@@ -51,6 +62,74 @@ def _is_verified(company: Company) -> bool:
     # Treat businesses with 4.0+ rating and > 50 reviews as "verified-like"
     return company.ratingValue >= 4.0 and company.reviewCount >= 50
 
+def _filter_loop(
+    companies: List[Company],
+    min_trust: Optional[float],
+    verified_only: bool,
+    country: Optional[str],
+    min_reviews: Optional[int],
+) -> List[Company]:
+    filtered: List[Company] = []
+    for company in companies:
+        if not _meets_min_trust(company, min_trust):
+            continue
+
+        if not _matches_country(company, country):
+            continue
+
+        if not _has_min_reviews(company, min_reviews):
+            continue
+
+        if verified_only and not _is_verified(company):
+            continue
+
+        filtered.append(company)
+    return filtered
+
+def _float_or_nan(value: Any) -> float:
+    number = _safe_float(value)
+    return float("nan") if number is None else number
+
+def _vectorized_filter(
+    companies: List[Company],
+    min_trust: Optional[float],
+    verified_only: bool,
+    country: Optional[str],
+    min_reviews: Optional[int],
+) -> List[Company]:
+    """
+    Same predicates as the loop in apply_company_filters, evaluated as
+    boolean masks over column arrays. Missing values are NaN, which fails
+    every comparison just like the None checks in the scalar helpers.
+    """
+    size = len(companies)
+    mask = np.ones(size, dtype=bool)
+
+    if min_trust is not None or verified_only:
+        ratings = np.fromiter(
+            (_float_or_nan(c.ratingValue) for c in companies),
+            dtype=np.float64,
+            count=size,
+        )
+    if min_reviews is not None or verified_only:
+        review_counts = np.fromiter(
+            (_float_or_nan(c.reviewCount) for c in companies),
+            dtype=np.float64,
+            count=size,
+        )
+
+    if min_trust is not None:
+        mask &= ratings >= min_trust
+    if country:
+        countries = np.array([(c.country or "").lower() for c in companies])
+        mask &= countries == country.lower()
+    if min_reviews is not None:
+        mask &= review_counts >= min_reviews
+    if verified_only:
+        mask &= (ratings >= 4.0) & (review_counts >= 50)
+
+    return [companies[i] for i in np.flatnonzero(mask)]
+
 def apply_company_filters(
     companies: List[Company],
     params: Dict[str, Any],
@@ -73,21 +152,14 @@ def apply_company_filters(
 
     country = params.get("country")
 
-    filtered: List[Company] = []
-    for company in companies:
-        if not _meets_min_trust(company, min_trust):
-            continue
-
-        if not _matches_country(company, country):
-            continue
-
-        if not _has_min_reviews(company, min_reviews):
-            continue
-
-        if verified_only and not _is_verified(company):
-            continue
-
-        filtered.append(company)
+    if np is not None and len(companies) > _VECTORIZE_THRESHOLD:
+        filtered = _vectorized_filter(
+            companies, min_trust, verified_only, country, min_reviews
+        )
+    else:
+        filtered = _filter_loop(
+            companies, min_trust, verified_only, country, min_reviews
+        )
 
     logger.info(
         "Applied filters (minTrustScore=%s, verifiedOnly=%s, country=%s, minReviews=%s). "
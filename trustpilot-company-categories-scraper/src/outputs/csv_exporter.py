@@ -1,17 +1,150 @@
-thonimport csv
+import csv
+import io
 import logging
+from itertools import chain, islice
+from operator import itemgetter
 from pathlib import Path
+from typing import Dict, Iterable
+
+try:  # pyarrow is optional; its CSV writer formats whole columns in C
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - depends on installed extras
+    pa = pa_csv = None
+
+try:  # pandas is optional; DataFrame.to_csv writes rows in compiled chunks
+    import pandas as pd
+except ImportError:  # pragma: no cover - depends on installed extras
+    pd = None
+
+try:  # Relative import when run as package
+    from .output_files import open_output, output_path_for
+except ImportError:  # Fallback when imports are absolute
+    from output_files import open_output, output_path_for  # type: ignore
+
+logger = logging.getLogger("trustpilot_scraper.csv_exporter")
+
+# Rows are projected to tuples and handed to csv.writer this many at a time
+_BATCH_SIZE = 50_000
+
+# Below this many rows, building a DataFrame costs more than to_csv saves
+_PANDAS_MIN_ROWS = 10_000
+
+def _row_getter(keys):
+    # itemgetter with a single key returns a bare value, not a 1-tuple
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda row: (row[key],)
+    return itemgetter(*keys)
+
+def _compile_padded_row_getter(keys):
+    """
+    Build a projection specialised for `keys` that substitutes "" for missing
+    fields, e.g. `lambda row: (row.get('ID', ''), row.get('name', ''))`.
+    Generating the tuple display once avoids a generator and a per-field loop
+    for every row; the keys are embedded via repr(), so any str is safe.
+    """
+    fields = "".join(f"row.get({key!r}, ''), " for key in keys)
+    return eval(compile(f"lambda row: ({fields})", "<csv-row-getter>", "eval"))
 
 class CSVExporter:
-    def export(self, data, output_path):
-        path = Path(output_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        if not data:
-            logging.warning("No data to export to CSV.")
+    def export(
+        self, data: Iterable[Dict], output_path, compress=False, engine=None
+    ):
+        """
+        Write `data` (dicts keyed like the first row) to `output_path`.
+
+        Any iterable is accepted, as is a pandas DataFrame. Large lists may
+        take the pandas path, which writes the same dialect as the csv
+        module; other iterables are consumed once, batch by batch, so a
+        generator can be exported without materializing it.
+        `compress=True` writes a zstd stream to `<output_path>.zst`.
+
+        `engine="pyarrow"` opts into pyarrow's C writer for lists. Its
+        dialect differs (quoted header and strings, "\n" line endings,
+        lowercase booleans, "4" for 4.0), so it is never used by default.
+        """
+        if engine not in (None, "pyarrow"):
+            raise ValueError(f"Unknown CSV engine: {engine!r}")
+        if engine == "pyarrow" and pa is None:
+            raise ImportError("engine='pyarrow' requires the 'pyarrow' package.")
+        path = output_path_for(Path(output_path), compress)
+        if pd is not None and isinstance(data, pd.DataFrame):
+            if data.empty:
+                logger.warning("No data to export to CSV.")
+                return
+            self._export_pandas(data, path, compress)
+            logger.info("CSV exported to %s", path)
             return
-        keys = data[0].keys()
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(data)
-        logging.info(f"CSV exported to {output_path}")
\ No newline at end of file
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
+            logger.warning("No data to export to CSV.")
+            return
+        # pyarrow and pandas need every row up front, and falling back to the
+        # csv module requires being able to read the rows a second time.
+        keys = list(first.keys())
+        if not isinstance(data, list) or not self._export_columnar(
+            data, keys, path, compress, engine
+        ):
+            self._export_stdlib(chain([first], rows), keys, path, compress)
+        logger.info("CSV exported to %s", path)
+
+    def _export_columnar(self, data, keys, path, compress, engine):
+        # Returns False when neither columnar writer applies to `data`
+        if engine == "pyarrow" and self._export_arrow(data, path, compress):
+            return True
+        if pd is not None and len(data) >= _PANDAS_MIN_ROWS:
+            # object dtype keeps values as-is (no int -> float for gaps);
+            # the win is the compiled row writer, not typed formatting.
+            frame = pd.DataFrame(data, columns=keys, dtype=object)
+            self._export_pandas(frame, path, compress)
+            return True
+        return False
+
+    def _export_arrow(self, data, path, compress):
+        # Rows pyarrow cannot type (mixed or nested values) are left to the
+        # csv module, which stringifies everything.
+        try:
+            table = pa.Table.from_pylist(data)
+            with open_output(path, compress=compress) as f:
+                pa_csv.write_csv(
+                    table, f, pa_csv.WriteOptions(quoting_style="needed")
+                )
+        except pa.ArrowException as exc:
+            logger.debug("pyarrow CSV export failed, using csv module: %s", exc)
+            return False
+        return True
+
+    def _export_pandas(self, frame, path, compress):
+        # Missing fields become "" (na_rep) and rows end in "\r\n", matching
+        # the csv module path. pandas renders to a str that is encoded once:
+        # it would write str to the zstd stream, which it cannot detect as a
+        # binary handle.
+        text = frame.to_csv(index=False, lineterminator="\r\n")
+        with open_output(path, compress=compress) as f:
+            f.write(text.encode("utf-8"))
+
+    def _export_stdlib(self, rows, keys, path, compress):
+        # csv.writer on pre-projected tuples avoids DictWriter's per-row,
+        # per-field Python lookups; itemgetter does the projection in C.
+        # Each batch is formatted into a StringIO and encoded once, so the
+        # binary file gets one large write per batch.
+        getter = _row_getter(keys)
+        padded_getter = None
+        buffer = io.StringIO(newline="")
+        writer = csv.writer(buffer)
+        writer.writerow(keys)
+        with open_output(path, compress=compress) as f:
+            for batch in iter(lambda: list(islice(rows, _BATCH_SIZE)), []):
+                try:
+                    projected = list(map(getter, batch))
+                except KeyError:
+                    # Like DictWriter's restval, missing fields become ""
+                    if padded_getter is None:
+                        padded_getter = _compile_padded_row_getter(keys)
+                    projected = list(map(padded_getter, batch))
+                writer.writerows(projected)
+                f.write(buffer.getvalue().encode("utf-8"))
+                buffer.seek(0)
+                buffer.truncate()
@@ -1,30 +1,333 @@
+import asyncio
 import json
 import logging
-from dataclasses import asdict, is_dataclass
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, is_dataclass
+from functools import partial
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Iterable, List
+from typing import (
+    IO, Any, Callable, Dict, Iterable, List, Optional, Tuple
+)
+
+try:  # orjson is optional; it serializes dataclasses natively, to bytes
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None  # type: ignore
+
+try:  # msgspec is the next fastest encoder; it also reads dataclasses in C
+    import msgspec
+except ImportError:  # pragma: no cover - depends on installed extras
+    msgspec = None  # type: ignore
+
+try:  # Relative import when run as package
+    from .csv_exporter import CSVExporter
+    from .json_exporter import JSONExporter
+    from .output_files import open_output, output_path_for
+except ImportError:  # Fallback when imports are absolute
+    from csv_exporter import CSVExporter  # type: ignore
+    from json_exporter import JSONExporter  # type: ignore
+    from output_files import open_output, output_path_for  # type: ignore
 
 logger = logging.getLogger("trustpilot_scraper.exporter")
 
-def _convert(obj: Any) -> Any:
+# List elements sampled to decide whether `companies` is plain dicts
+_PLAIN_SAMPLE_SIZE = 8
+
+# Below this many companies per shard, worker start-up costs more than it saves
+_MIN_SHARD_SIZE = 1_000
+
+# Per dataclass type: (field names, getter returning their values as a tuple)
+_FIELD_GETTERS: Dict[type, Tuple[Tuple[str, ...], Callable[[Any], tuple]]] = {}
+
+def _field_getter(cls: type) -> Tuple[Tuple[str, ...], Callable[[Any], tuple]]:
     """
-    Recursively convert dataclasses into plain dicts and ensure that
-    everything is JSON-serializable.
+    Resolve a dataclass's field names once and read all values with a
+    single attrgetter call, instead of calling fields() and getattr() per
+    field on every instance.
     """
-    if is_dataclass(obj):
-        return {k: _convert(v) for k, v in asdict(obj).items()}
-    if isinstance(obj, dict):
-        return {str(k): _convert(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple, set)):
-        return [_convert(v) for v in obj]
-    return obj
+    names = tuple(f.name for f in fields(cls))
+    if len(names) > 1:
+        getter = attrgetter(*names)
+    else:
+        # attrgetter with one name returns a bare value, not a 1-tuple
+        getter = lambda o: tuple(getattr(o, name) for name in names)
+    _FIELD_GETTERS[cls] = (names, getter)
+    return names, getter
+
+class _DataclassEncoder(json.JSONEncoder):
+    """
+    JSON encoder that serializes dataclasses and sets as they are reached,
+    so the original objects are encoded in a single pass instead of first
+    being copied into a tree of plain dicts.
+    """
+
+    def default(self, o: Any) -> Any:
+        cached = _FIELD_GETTERS.get(type(o))
+        if cached is not None:
+            names, getter = cached
+            return dict(zip(names, getter(o)))
+        if is_dataclass(o) and not isinstance(o, type):
+            names, getter = _field_getter(type(o))
+            return dict(zip(names, getter(o)))
+        if isinstance(o, (set, frozenset)):
+            return list(o)
+        return super().default(o)
+
+# Shared encoders. "pretty" matches json.dump(..., indent=2); "compact" drops
+# all optional whitespace, which roughly halves the output size.
+_PRETTY_ENCODER = _DataclassEncoder(ensure_ascii=False, indent=2)
+_COMPACT_ENCODER = _DataclassEncoder(ensure_ascii=False, separators=(",", ":"))
 
-def export_companies(companies: Iterable[Any], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+# (first prefix, separator, suffix, empty document) for each output layout;
+# "ndjson" writes one compact object per line for streaming consumers.
+_LAYOUTS = {
+    "pretty": (b"[\n  ", b",\n  ", b"\n]", b"[]"),
+    "compact": (b"[", b",", b"]", b"[]"),
+    "ndjson": (b"", b"\n", b"\n", b""),
+}
 
-    serializable: List[Any] = [_convert(c) for c in companies]
+def _orjson_default(obj: Any) -> Any:
+    # orjson handles dataclasses, dicts, lists and tuples itself
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(serializable, f, ensure_ascii=False, indent=2)
+def _stdlib_encoder(layout: str) -> Callable[[Any], bytes]:
+    # Raw newlines only occur between tokens (never inside JSON strings), so
+    # replacing them re-indents a pretty-printed element one level under "[".
+    if layout == "pretty":
+        return lambda obj: (
+            _PRETTY_ENCODER.encode(obj).replace("\n", "\n  ").encode("utf-8")
+        )
+    return lambda obj: _COMPACT_ENCODER.encode(obj).encode("utf-8")
+
+def _orjson_encoder(layout: str) -> Callable[[Any], bytes]:
+    # orjson reads dataclasses natively; only sets need the default hook
+    options = orjson.OPT_NON_STR_KEYS
+    if layout == "pretty":
+        options |= orjson.OPT_INDENT_2
+        return lambda obj: orjson.dumps(
+            obj, default=_orjson_default, option=options
+        ).replace(b"\n", b"\n  ")
+    return lambda obj: orjson.dumps(obj, default=_orjson_default, option=options)
+
+def _msgspec_encoder(layout: str) -> Callable[[Any], bytes]:
+    # msgspec encodes dataclasses, sets and tuples itself; its formatter
+    # matches json.dumps(indent=2), so pretty output re-indents like above.
+    encode = msgspec.json.Encoder().encode
+    if layout == "pretty":
+        return lambda obj: msgspec.json.format(encode(obj), indent=2).replace(
+            b"\n", b"\n  "
+        )
+    return encode
+
+def _with_stdlib_fallback(
+    encode: Callable[[Any], bytes], fallback: Callable[[Any], bytes]
+) -> Callable[[Any], bytes]:
+    # orjson rejects values the stdlib writes, e.g. ints beyond 64 bits;
+    # those objects are re-encoded with the (identically laid out) fallback.
+    def encode_or_fallback(obj: Any) -> bytes:
+        try:
+            return encode(obj)
+        except orjson.JSONEncodeError:
+            return fallback(obj)
+
+    return encode_or_fallback
+
+def _element_encoder(layout: str) -> Callable[[Any], bytes]:
+    if orjson is not None:
+        return _with_stdlib_fallback(
+            _orjson_encoder(layout), _stdlib_encoder(layout)
+        )
+    if msgspec is not None:
+        return _msgspec_encoder(layout)
+    return _stdlib_encoder(layout)
+
+def _document_encoder(pretty: bool) -> Callable[[Any], bytes]:
+    # Encodes a whole list in one call; the bytes match what the streamed
+    # "pretty" / "compact" layouts write element by element.
+    encoder = _PRETTY_ENCODER if pretty else _COMPACT_ENCODER
+    stdlib_encode = lambda obj: encoder.encode(obj).encode("utf-8")
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return _with_stdlib_fallback(
+            lambda obj: orjson.dumps(obj, default=_orjson_default, option=options),
+            stdlib_encode,
+        )
+    if msgspec is not None:
+        encode = msgspec.json.Encoder().encode
+        if pretty:
+            return lambda obj: msgspec.json.format(encode(obj), indent=2)
+        return encode
+    return stdlib_encode
+
+def _is_plain_dict_list(companies: Iterable[Any]) -> bool:
+    # Sampling keeps the check O(1); anything the sample misses (e.g. a
+    # later dataclass) is still handled by the encoders' default hooks.
+    return isinstance(companies, list) and all(
+        type(c) is dict for c in companies[:_PLAIN_SAMPLE_SIZE]
+    )
+
+def _write_json_documents(
+    items: Iterable[Any],
+    f: IO,
+    encode: Callable[[Any], Any],
+    layout: str,
+) -> int:
+    """
+    Stream `items` into `f` in the given layout, encoding one element at a
+    time so neither a converted list nor the full document string is held
+    in memory. Returns the number of elements written.
+    """
+    first, separator, suffix, empty = _LAYOUTS[layout]
+    count = 0
+    for item in items:
+        f.write(separator if count else first)
+        f.write(encode(item))
+        count += 1
+    f.write(suffix if count else empty)
+    return count
 
-    logger.info("Wrote %d companies to %s", len(serializable), output_path)
\ No newline at end of file
+def export_companies(
+    companies: Iterable[Any],
+    output_path: Path,
+    pretty: bool = False,
+    ndjson: bool = False,
+    compress: bool = False,
+) -> None:
+    """
+    Write `companies` as a JSON array: compact by default, indented with
+    `pretty=True`, or as newline-delimited JSON (one object per line) with
+    `ndjson=True`. `compress=True` writes a zstd stream to
+    `<output_path>.zst` instead.
+    """
+    output_path = output_path_for(output_path, compress)
+    layout = "ndjson" if ndjson else ("pretty" if pretty else "compact")
+
+    if not ndjson and _is_plain_dict_list(companies):
+        # Parser output is already JSON-ready, so one encoder call over the
+        # whole list beats per-element calls (roughly 2x in practice).
+        with open_output(output_path, compress=compress) as f:
+            f.write(_document_encoder(pretty)(companies))
+        logger.info("Wrote %d companies to %s", len(companies), output_path)
+        return
+
+    encode = _element_encoder(layout)
+    with open_output(output_path, compress=compress) as f:
+        count = _write_json_documents(companies, f, encode, layout)
+
+    logger.info("Wrote %d companies to %s", count, output_path)
+
+def _shard_slices(companies: Iterable[Any], shards: Optional[int]) -> List[list]:
+    # Up to `shards` contiguous slices (default: one per CPU), each holding
+    # at least _MIN_SHARD_SIZE companies; always at least one slice.
+    # Sized sequences are sliced directly; only other iterables are copied.
+    items = companies if isinstance(companies, (list, tuple)) else list(companies)
+    requested = shards or os.cpu_count() or 1
+    shard_count = max(1, min(requested, math.ceil(len(items) / _MIN_SHARD_SIZE)))
+    shard_size = math.ceil(len(items) / shard_count) if items else 0
+    return [
+        items[i * shard_size : (i + 1) * shard_size] for i in range(shard_count)
+    ]
+
+def _encode_shard(items: List[Any], layout: str) -> bytes:
+    # Elements joined by the layout separator, without the array framing
+    _, separator, _, _ = _LAYOUTS[layout]
+    return separator.join(map(_element_encoder(layout), items))
+
+def export_companies_sharded(
+    companies: Iterable[Any],
+    output_dir: Path,
+    shards: Optional[int] = None,
+    pretty: bool = False,
+    compress: bool = False,
+) -> List[Path]:
+    """
+    Split `companies` into up to `shards` contiguous slices (default: one per
+    CPU) and write each to `output_dir/part-<i>.json` in its own process, so
+    encoding runs in parallel instead of contending for the GIL. Small inputs
+    are written as a single part in-process. Returns the paths written, in
+    order; with `compress=True` they end in ".json.zst".
+    """
+    slices = _shard_slices(companies, shards)
+    shard_count = len(slices)
+    paths = [output_dir / f"part-{i}.json" for i in range(shard_count)]
+    write_shard = partial(export_companies, pretty=pretty, compress=compress)
+
+    if shard_count == 1:
+        write_shard(slices[0], paths[0])
+    else:
+        with ProcessPoolExecutor(max_workers=shard_count) as executor:
+            # list() re-raises the first worker error, if any
+            list(executor.map(write_shard, slices, paths))
+
+    logger.info(
+        "Wrote %d companies to %d shards in %s",
+        sum(map(len, slices)),
+        shard_count,
+        output_dir,
+    )
+    return [output_path_for(path, compress) for path in paths]
+
+def export_companies_parallel(
+    companies: Iterable[Any],
+    output_path: Path,
+    shards: Optional[int] = None,
+    pretty: bool = False,
+    compress: bool = False,
+) -> None:
+    """
+    Write `companies` to a single JSON array, encoding contiguous slices in
+    parallel processes like export_companies_sharded. Encoded slices are
+    written in order as they arrive, so later slices keep encoding while
+    earlier ones are being written. Small inputs are encoded in-process.
+    """
+    slices = _shard_slices(companies, shards)
+    if len(slices) == 1:
+        export_companies(slices[0], output_path, pretty=pretty, compress=compress)
+        return
+
+    output_path = output_path_for(output_path, compress)
+    layout = "pretty" if pretty else "compact"
+    first, separator, suffix, _ = _LAYOUTS[layout]
+    with ProcessPoolExecutor(max_workers=len(slices)) as executor:
+        encode_shard = partial(_encode_shard, layout=layout)
+        with open_output(output_path, compress=compress) as f:
+            for i, chunk in enumerate(executor.map(encode_shard, slices)):
+                f.write(separator if i else first)
+                f.write(chunk)
+            f.write(suffix)
+
+    logger.info(
+        "Wrote %d companies from %d shards to %s",
+        sum(map(len, slices)),
+        len(slices),
+        output_path,
+    )
+
+async def export_all(
+    data: Iterable[dict],
+    csv_path: Path,
+    json_path: Path,
+    compress: bool = False,
+) -> None:
+    """
+    Write the same rows as CSV and JSON at once. Each exporter runs in its
+    own worker thread, so one file's disk writes overlap with the other's
+    encoding instead of the two exports running back to back.
+    """
+    # Both exporters read the rows, so a one-shot iterator is drained once
+    rows = data if isinstance(data, list) else list(data)
+    await asyncio.gather(
+        asyncio.to_thread(
+            CSVExporter().export, rows, csv_path, compress=compress
+        ),
+        asyncio.to_thread(
+            JSONExporter().export, rows, json_path, compress=compress
+        ),
+    )
@@ -1,11 +1,48 @@
-thonimport json
+import json
 import logging
 from pathlib import Path
 
+try:  # orjson is optional; it encodes straight to bytes and is much faster
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+try:  # msgspec is the next fastest encoder when orjson is missing
+    import msgspec
+except ImportError:  # pragma: no cover - depends on installed extras
+    msgspec = None
+
+try:  # Relative import when run as package
+    from .output_files import open_output, output_path_for
+except ImportError:  # Fallback when imports are absolute
+    from output_files import open_output, output_path_for  # type: ignore
+
+logger = logging.getLogger("trustpilot_scraper.json_exporter")
+
 class JSONExporter:
-    def export(self, data, output_path):
-        path = Path(output_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-        logging.info(f"JSON exported to {output_path}")
\ No newline at end of file
+    def export(self, data, output_path, pretty=False, compress=False):
+        # Compact output by default; pretty=True restores 2-space indentation
+        # and compress=True writes a zstd stream to "<output_path>.zst".
+        path = output_path_for(Path(output_path), compress)
+        encoded = None
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            try:
+                encoded = orjson.dumps(data, option=option)
+            except orjson.JSONEncodeError as exc:
+                # e.g. ints beyond 64 bits, which json.dumps still writes
+                logger.debug("orjson export failed, using json module: %s", exc)
+        elif msgspec is not None:
+            encoded = msgspec.json.encode(data)
+            if pretty:
+                encoded = msgspec.json.format(encoded, indent=2)
+        if encoded is None:
+            # One dumps() call plus one encode beats json.dump's many small
+            # text writes; the output is ASCII (ensure_ascii) anyway.
+            layout = {"indent": 2} if pretty else {"separators": (",", ":")}
+            encoded = json.dumps(data, **layout).encode("utf-8")
+        with open_output(path, compress=compress) as f:
+            f.write(encoded)
+        logger.info("JSON exported to %s", path)
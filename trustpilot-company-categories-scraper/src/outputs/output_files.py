@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+try:  # zstandard is optional; it is only needed for compressed exports
+    import zstandard as zstd
+except ImportError:  # pragma: no cover - depends on installed extras
+    zstd = None  # type: ignore
+
+# Large user-space buffer so big exports go out in few write() syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# zstd level 3 keeps CPU cost low while still shrinking the very repetitive
+# scrape output (field names, URLs, categories) several times over.
+ZSTD_LEVEL = 3
+
+def output_path_for(path: Path, compress: bool) -> Path:
+    """Return the path actually written, adding ".zst" when compressing."""
+    if compress and path.suffix != ".zst":
+        return path.with_name(path.name + ".zst")
+    return path
+
+def _ensure_parent(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+def _open_file(path: Path) -> BinaryIO:
+    # Parent directories are created only when the open fails, so writing
+    # into an existing folder costs no extra mkdir/stat syscalls, and a
+    # folder removed between exports is simply created again.
+    try:
+        return open(path, "wb", buffering=WRITE_BUFFER_SIZE)
+    except FileNotFoundError:
+        _ensure_parent(path)
+        return open(path, "wb", buffering=WRITE_BUFFER_SIZE)
+
+@contextmanager
+def open_output(path: Path, compress: bool = False) -> Iterator[BinaryIO]:
+    """
+    Open `path` for binary writing with a large buffer. Exporters hand it
+    already-encoded bytes, so there is no per-write TextIOWrapper encoding
+    step. With `compress=True` the data is streamed through a multi-threaded
+    zstd compressor instead.
+    """
+    if not compress:
+        with _open_file(path) as f:
+            yield f
+        return
+
+    if zstd is None:
+        raise ImportError("compress=True requires the 'zstandard' package.")
+
+    compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+    with _open_file(path) as raw:
+        with compressor.stream_writer(raw) as compressed:
+            yield compressed
@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+import requests
+
+from src.extractors import company_parser
+
+PAGE = """<html><head>
+<script type="application/ld+json">{"@type": "WebSite", "name": "Trustpilot"}</script>
+<script type="application/ld+json">
+  {"@type": "ORGANIZATION", "@id": "acme", "name": "Acmé",
+   "address": {"addressCountry": "GB"}, "category": ["Shops", "Retail"]}
+</script>
+<script type="application/ld+json">
+  [{"@type": "LocalBusiness", "@id": "beta", "name": "Beta"},
+   {"@type": "Organization", "@id": "acme", "name": "Duplicate"}]
+</script>
+<script type="application/ld+json">{"@type": "Organization", broken</script>
+</head><body></body></html>"""
+
+@pytest.fixture(params=["lexbor", "lxml", "stdlib"])
+def backend(request, monkeypatch):
+    # The backend is chosen per call, so disabling the faster ones is enough
+    if request.param == "lexbor" and company_parser.LexborHTMLParser is None:
+        pytest.skip("selectolax is not installed")
+    if request.param == "lxml" and company_parser._LD_JSON_XPATH is None:
+        pytest.skip("lxml is not installed")
+    if request.param in ("lxml", "stdlib"):
+        monkeypatch.setattr(company_parser, "LexborHTMLParser", None)
+    if request.param == "stdlib":
+        monkeypatch.setattr(company_parser, "_LD_JSON_XPATH", None)
+    return request.param
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_parse_ld_json_blocks(backend, as_bytes):
+    html = PAGE.encode("utf-8") if as_bytes else PAGE
+    companies = company_parser._parse_ld_json_blocks(
+        html, "https://www.trustpilot.com", updated_at="2024-01-01T00:00:00+00:00"
+    )
+    # Non-business and undecodable blocks are skipped; the first block wins
+    assert list(companies) == ["acme", "beta"]
+    acme = companies["acme"]
+    assert acme.name == "Acmé"
+    assert acme.country == "GB"
+    assert acme.categories == ["Shops", "Retail"]
+    assert acme.aiSummary["updatedAt"] == "2024-01-01T00:00:00+00:00"
+
+def _response(body):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.encoding = "utf-8"
+    return resp
+
+class _OutOfOrderSession:
+    """Stub session whose first URL only completes after the last one."""
+
+    def __init__(self, urls):
+        self.last_done = threading.Event()
+        self.first, self.last = urls[0], urls[-1]
+        self.completed = []
+
+    def get(self, url):
+        if url == self.first:
+            assert self.last_done.wait(5), "fetches did not run concurrently"
+        self.completed.append(url)
+        if url == self.last:
+            self.last_done.set()
+        return _response(url.encode())
+
+def test_fetch_pages_keeps_url_order():
+    urls = [f"https://example.com/page/{i}" for i in range(4)]
+    session = _OutOfOrderSession(urls)
+    bodies = list(company_parser._fetch_pages(session, urls, {"concurrency": 4}))
+    assert session.completed[0] != urls[0]
+    assert bodies == [url.encode() for url in urls]
+
+def test_rate_limit_spaces_calls(monkeypatch):
+    clock = [100.0]
+    sleeps, calls = [], []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(company_parser.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(company_parser.time, "sleep", sleep)
+    request = company_parser._wrap_request_with_rate_limit(
+        lambda method, url, **kwargs: calls.append(clock[0]), 4
+    )
+    for _ in range(4):
+        request("GET", "https://example.com")
+    assert all(b - a >= 0.25 for a, b in zip(calls, calls[1:]))
+    assert calls[0] == 100.0  # the first call never waits
+
+    clock[0] += 10  # after an idle period the next call is not delayed
+    request("GET", "https://example.com")
+    assert calls[-1] == clock[0]
+    assert len(sleeps) == 3
+
+def test_attach_reviews_survives_failing_worker(monkeypatch):
+    def fetch_reviews(session, company_url, language, max_reviews, config):
+        if company_url.endswith("/bad"):
+            raise RuntimeError("boom")
+        return [f"{company_url}#{i}" for i in range(5)]
+
+    monkeypatch.setattr(company_parser, "fetch_reviews", fetch_reviews)
+    companies = [
+        company_parser.Company(ID=name, sourceUrl=f"https://example.com/{name}")
+        for name in ("a", "bad", "b")
+    ]
+    company_parser._attach_reviews_to_companies(
+        None, companies, {"reviewConcurrency": 3}, {"includeReviews": True}
+    )
+    good, bad, other = companies
+    assert good.reviews == [f"https://example.com/a#{i}" for i in range(5)]
+    assert good.lastReviews == good.reviews[:3]
+    assert other.reviews == [f"https://example.com/b#{i}" for i in range(5)]
+    assert bad.reviews == [] and bad.lastReviews == []
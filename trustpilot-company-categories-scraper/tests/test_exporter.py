@@ -0,0 +1,224 @@
+import asyncio
+import csv
+import dataclasses
+import json
+import shutil
+
+import pytest
+
+from src.extractors.company_parser import Company
+from src.extractors.review_parser import Consumer, Review
+from src.outputs import csv_exporter
+from src.outputs.csv_exporter import CSVExporter
+from src.outputs import exporter
+from src.outputs.exporter import (
+    export_all,
+    export_companies,
+    export_companies_parallel,
+    export_companies_sharded,
+)
+from src.outputs.json_exporter import JSONExporter
+
+def test_export_companies_writes_json_array(tmp_path):
+    companies = [{"ID": "1", "name": "Test", "categories": ["a", "b"]}, {"ID": "2"}]
+    output_path = tmp_path / "out" / "companies.json"
+    export_companies(companies, output_path)
+    text = output_path.read_text(encoding="utf-8")
+    assert json.loads(text) == companies
+    assert text == json.dumps(companies, ensure_ascii=False, separators=(",", ":"))
+
+def test_export_companies_pretty_and_ndjson(tmp_path):
+    companies = [{"ID": "1", "name": "Tést"}, {"ID": "2"}]
+    export_companies(companies, tmp_path / "pretty.json", pretty=True)
+    assert (tmp_path / "pretty.json").read_text(encoding="utf-8") == json.dumps(
+        companies, ensure_ascii=False, indent=2
+    )
+    export_companies(companies, tmp_path / "companies.ndjson", ndjson=True)
+    lines = (tmp_path / "companies.ndjson").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == companies
+
+def test_export_companies_handles_empty_input(tmp_path):
+    output_path = tmp_path / "companies.json"
+    export_companies([], output_path)
+    assert json.loads(output_path.read_text(encoding="utf-8")) == []
+
+def test_csv_exporter_streams_generators(tmp_path):
+    rows = ({"ID": str(i), "name": f"Company {i}"} for i in range(3))
+    output_path = tmp_path / "companies.csv"
+    CSVExporter().export(rows, output_path)
+    with open(output_path, newline="", encoding="utf-8") as f:
+        written = list(csv.DictReader(f))
+    assert [r["ID"] for r in written] == ["0", "1", "2"]
+    assert written[2]["name"] == "Company 2"
+
+def test_export_companies_compress_writes_zst(tmp_path):
+    zstd = pytest.importorskip("zstandard")
+    companies = [{"ID": "1", "name": "Test"}, {"ID": "2"}]
+    export_companies(companies, tmp_path / "companies.json", compress=True)
+    with open(tmp_path / "companies.json.zst", "rb") as f:
+        raw = zstd.ZstdDecompressor().stream_reader(f).read()
+    assert json.loads(raw) == companies
+    assert not (tmp_path / "companies.json").exists()
+
+def test_csv_exporter_list_matches_generator_output(tmp_path):
+    rows = [
+        {"ID": "1", "name": "A, b", "verified": True, "rating": 4.0, "n": None},
+        {"ID": "2", "name": 'Say "hi"', "verified": False, "rating": 1.5, "n": 3},
+    ]
+    CSVExporter().export(rows, tmp_path / "list.csv")
+    CSVExporter().export(iter(rows), tmp_path / "gen.csv")
+    written = (tmp_path / "list.csv").read_bytes()
+    assert written == (tmp_path / "gen.csv").read_bytes()
+    assert written == (
+        b'ID,name,verified,rating,n\r\n1,"A, b",True,4.0,\r\n'
+        b'2,"Say ""hi""",False,1.5,3\r\n'
+    )
+
+def test_export_all_writes_csv_and_json(tmp_path):
+    rows = ({"ID": str(i), "name": f"Company {i}"} for i in range(3))
+    csv_path, json_path = tmp_path / "companies.csv", tmp_path / "companies.json"
+    asyncio.run(export_all(rows, csv_path, json_path))
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        assert [r["ID"] for r in csv.DictReader(f)] == ["0", "1", "2"]
+    assert [c["ID"] for c in json.loads(json_path.read_text())] == ["0", "1", "2"]
+
+def test_json_exporter_writes_values_orjson_rejects(tmp_path):
+    output_path = tmp_path / "data.json"
+    JSONExporter().export({"counts": {1: 2}, "big": 2**70}, output_path)
+    assert json.loads(output_path.read_text(encoding="utf-8")) == {
+        "counts": {"1": 2},
+        "big": 2**70,
+    }
+
+def test_exporters_recreate_removed_output_directory(tmp_path):
+    output_dir = tmp_path / "out"
+    rows = [{"ID": "1"}]
+    for _ in range(2):
+        export_companies(rows, output_dir / "companies.json")
+        CSVExporter().export(rows, output_dir / "companies.csv")
+        JSONExporter().export(rows, output_dir / "data.json")
+        assert sorted(p.name for p in output_dir.iterdir()) == [
+            "companies.csv",
+            "companies.json",
+            "data.json",
+        ]
+        shutil.rmtree(output_dir)
+
+def _read_output(path, compress):
+    if not compress:
+        return path.read_bytes()
+    zstd = pytest.importorskip("zstandard")
+    with open(path.with_name(path.name + ".zst"), "rb") as f:
+        return zstd.ZstdDecompressor().stream_reader(f).read()
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_csv_exporter_pandas_matches_generator_output(tmp_path, compress):
+    pd = pytest.importorskip("pandas")
+    if compress:
+        pytest.importorskip("zstandard")
+    rows = [
+        {
+            "ID": str(i),
+            "name": f"Café, {i}",
+            "verified": i % 2 == 0,
+            "rating": i / 4,
+            "n": None if i % 3 else i,
+        }
+        for i in range(csv_exporter._PANDAS_MIN_ROWS)
+    ]
+    exporter = CSVExporter()
+    exporter.export(iter(rows), tmp_path / "gen.csv", compress=compress)
+    exporter.export(rows, tmp_path / "list.csv", compress=compress)
+    # A caller-built frame is written with its own dtypes; object keeps values
+    frame = pd.DataFrame(rows, dtype=object)
+    exporter.export(frame, tmp_path / "frame.csv", compress=compress)
+    expected = _read_output(tmp_path / "gen.csv", compress)
+    assert _read_output(tmp_path / "list.csv", compress) == expected
+    assert _read_output(tmp_path / "frame.csv", compress) == expected
+
+def _sharded_rows(count):
+    return [{"ID": str(i), "name": f"Company {i}"} for i in range(count)]
+
+def test_export_companies_sharded_splits_in_order(tmp_path):
+    rows = _sharded_rows(exporter._MIN_SHARD_SIZE * 2 + 10)
+    paths = export_companies_sharded(rows, tmp_path / "shards", shards=2)
+    assert [p.name for p in paths] == ["part-0.json", "part-1.json"]
+    parts = [json.loads(p.read_text(encoding="utf-8")) for p in paths]
+    assert all(parts)
+    assert [row for part in parts for row in part] == rows
+
+@pytest.mark.parametrize("count", [0, 10])
+def test_export_companies_sharded_small_input_is_one_part(tmp_path, count):
+    rows = _sharded_rows(count)
+    paths = export_companies_sharded(rows, tmp_path / "shards", shards=4)
+    assert [p.name for p in paths] == ["part-0.json"]
+    assert json.loads(paths[0].read_text(encoding="utf-8")) == rows
+
+def test_export_companies_sharded_compress(tmp_path):
+    pytest.importorskip("zstandard")
+    rows = _sharded_rows(exporter._MIN_SHARD_SIZE * 2 + 10)
+    paths = export_companies_sharded(
+        rows, tmp_path / "shards", shards=2, compress=True
+    )
+    assert [p.name for p in paths] == ["part-0.json.zst", "part-1.json.zst"]
+    parts = [json.loads(_read_output(p.with_suffix(""), True)) for p in paths]
+    assert [row for part in parts for row in part] == rows
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"pretty": True}, {"compress": True}],
+    ids=["compact", "pretty", "compress"],
+)
+def test_export_companies_parallel_matches_export_companies(tmp_path, options):
+    compress = options.get("compress", False)
+    if compress:
+        pytest.importorskip("zstandard")
+    rows = _sharded_rows(exporter._MIN_SHARD_SIZE * 3 + 7)
+    rows[5]["tags"] = ["a", "b"]  # nested values cross the re-indent too
+    export_companies_parallel(rows, tmp_path / "parallel.json", shards=3, **options)
+    export_companies(rows, tmp_path / "single.json", **options)
+    assert _read_output(tmp_path / "parallel.json", compress) == _read_output(
+        tmp_path / "single.json", compress
+    )
+
+def _company_with_reviews(i):
+    consumer = Consumer(
+        id=None,
+        displayName="Jöe",
+        imageUrl=None,
+        isVerified=True,
+        numberOfReviews=3,
+        countryCode="GB",
+    )
+    review = Review(
+        id=f"r{i}",
+        text="Loved it",
+        title="Great",
+        rating=5,
+        date={"createdAt": "2024-01-15T10:30:00+00:00"},
+        consumer=consumer,
+    )
+    company = Company(ID=str(i), name=f"Acmé {i}", reviews=[review])
+    company.lastReviews = [review]
+    company.categories = {"Shops"}  # sets are written as JSON arrays
+    return company
+
+# Encoders are tried in order, so each backend hides the ones ahead of it
+_FASTER_ENCODERS = {"orjson": (), "msgspec": ("orjson",), "stdlib": ("orjson", "msgspec")}
+
+@pytest.mark.parametrize("backend", sorted(_FASTER_ENCODERS))
+def test_export_companies_writes_dataclasses(tmp_path, monkeypatch, backend):
+    if backend != "stdlib" and getattr(exporter, backend) is None:
+        pytest.skip(f"{backend} is not installed")
+    for name in _FASTER_ENCODERS[backend]:
+        monkeypatch.setattr(exporter, name, None)
+    companies = [_company_with_reviews(i) for i in range(3)]
+    expected = json.dumps(
+        [dataclasses.asdict(c) for c in companies],
+        ensure_ascii=False,
+        indent=2,
+        default=list,
+    )
+    for _ in range(2):  # the second pass reuses the cached field getters
+        export_companies(companies, tmp_path / "companies.json", pretty=True)
+        assert (tmp_path / "companies.json").read_text(encoding="utf-8") == expected
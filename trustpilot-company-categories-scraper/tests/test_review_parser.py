@@ -0,0 +1,98 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.extractors.review_parser import _parse_date_iso
+
+REVIEW_PARSER_PATH = (
+    Path(__file__).resolve().parent.parent / "src" / "extractors" / "review_parser.py"
+)
+
+CARD = """<div data-service-review-id="r1">
+  <a href="/reviews/r1">link</a>
+  <h2>Great</h2>
+  <p data-review-text-typography>Loved it</p>
+  <div data-rating="5"></div>
+  <time datetime="2024-01-15T10:30:00.000Z">Jan 15</time>
+  <span data-consumer-name>Jöe</span>
+  <img src="https://img/a.png">
+  <span data-consumer-country>us</span>
+  <span data-consumer-reviews-count="10"></span>
+  <span class="badge--verified"></span>
+</div>"""
+
+# Modules to hide so that review_parser falls back to each backend
+_BLOCKED = {
+    "lexbor": (),
+    "lxml": ("selectolax.lexbor",),
+    "bs4": ("selectolax.lexbor", "cssselect"),
+}
+_REQUIRED = {"lexbor": "selectolax.lexbor", "lxml": "cssselect", "bs4": "bs4"}
+
+def test_parse_date_iso_normalizes_utc_suffix():
+    assert _parse_date_iso("2024-01-15T10:30:00.000Z") == {
+        "createdAt": "2024-01-15T10:30:00+00:00"
+    }
+    assert _parse_date_iso("2024-01-15T10:30:00.12Z") == {
+        "createdAt": "2024-01-15T10:30:00.120000+00:00"
+    }
+
+def test_parse_date_iso_falls_back_for_other_formats():
+    assert _parse_date_iso("2024-01-15") == {"createdAt": "2024-01-15T00:00:00"}
+    assert _parse_date_iso("yesterday") == {"createdAt": "yesterday"}
+    # Out-of-range fields are not normalized by the fast path either
+    assert _parse_date_iso("2024-13-45T99:99:99Z") == {
+        "createdAt": "2024-13-45T99:99:99Z"
+    }
+    assert _parse_date_iso("２０２４-01-15T10:30:00Z") == {
+        "createdAt": "２０２４-01-15T10:30:00Z"
+    }
+    assert _parse_date_iso("2023-02-29T10:00:00Z") == {
+        "createdAt": "2023-02-29T10:00:00Z"
+    }
+    assert _parse_date_iso("2024-02-29T10:00:00Z") == {
+        "createdAt": "2024-02-29T10:00:00+00:00"
+    }
+
+@pytest.fixture(params=sorted(_BLOCKED))
+def review_parser(request, monkeypatch):
+    # The backend is picked at import time, so load a private copy of the
+    # module with the faster parsers hidden.
+    pytest.importorskip(_REQUIRED[request.param])
+    for name in _BLOCKED[request.param]:
+        monkeypatch.setitem(sys.modules, name, None)
+    name = f"_review_parser_{request.param}"
+    spec = importlib.util.spec_from_file_location(name, REVIEW_PARSER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses resolves the (postponed) annotations via sys.modules
+    monkeypatch.setitem(sys.modules, name, module)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.mark.parametrize(
+    "html, count",
+    [
+        (f"<html><body>{CARD}{CARD}</body></html>", 2),
+        (CARD, 1),  # the card is the root element of a fragment
+        (CARD.encode("utf-8"), 1),
+    ],
+    ids=["page", "fragment", "bytes"],
+)
+def test_parse_reviews_from_html(review_parser, html, count):
+    reviews = review_parser._parse_reviews_from_html(html)
+    assert len(reviews) == count
+    review = reviews[0]
+    assert (review.id, review.title, review.text, review.rating) == (
+        "r1",
+        "Great",
+        "Loved it",
+        5,
+    )
+    assert review.date == {"createdAt": "2024-01-15T10:30:00+00:00"}
+    consumer = review.consumer
+    assert (consumer.displayName, consumer.countryCode) == ("Jöe", "US")
+    assert consumer.imageUrl == "https://img/a.png"
+    assert consumer.numberOfReviews == 10
+    assert consumer.isVerified is True
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from src.extractors.company_parser import Company
+from src.extractors.utils_filters import (
+    _VECTORIZE_THRESHOLD,
+    _filter_loop,
+    _vectorized_filter,
+    apply_company_filters,
+)
+
+def _random_companies(count):
+    rng = random.Random(1)
+    return [
+        Company(
+            ID=str(i),
+            ratingValue=rng.choice([None, 1.0, 3.9, 4.0, 4.3, 5.0]),
+            reviewCount=rng.choice([None, 0, 10, 49, 50, 120]),
+            country=rng.choice([None, "", "GB", "gb", "US"]),
+        )
+        for i in range(count)
+    ]
+
+@pytest.mark.parametrize(
+    "min_trust, verified_only, country, min_reviews",
+    [
+        (None, False, None, None),
+        (4.0, False, None, None),
+        (None, False, "gb", None),
+        (None, False, None, 50),
+        (None, True, None, None),
+        (4.3, True, "US", 10),
+    ],
+)
+def test_vectorized_filter_matches_loop(
+    min_trust, verified_only, country, min_reviews
+):
+    pytest.importorskip("numpy")
+    companies = _random_companies(_VECTORIZE_THRESHOLD * 4)
+    args = (min_trust, verified_only, country, min_reviews)
+    expected = [c.ID for c in _filter_loop(companies, *args)]
+    assert [c.ID for c in _vectorized_filter(companies, *args)] == expected
+
+def test_apply_company_filters_parses_string_params():
+    companies = _random_companies(_VECTORIZE_THRESHOLD * 2)
+    filtered = apply_company_filters(
+        companies, {"minTrustScore": "4.0", "minReviews": "50", "country": "GB"}
+    )
+    assert filtered == _filter_loop(companies, 4.0, False, "GB", 50)